@@ -1,32 +1,66 @@
 # db.py
 
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+import atexit
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Literal, Optional, Tuple, Union
 
 import psycopg
 from loguru import logger
 from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool
 
 from config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER, UTC_PLUS_2
 
+_pool: Optional[ConnectionPool] = None
+
+
+def get_pool() -> ConnectionPool:
+    """Return the shared connection pool, opening it on first use."""
+    global _pool
+    if _pool is None:
+        conninfo = make_conninfo(
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT,
+        )
+        _pool = ConnectionPool(
+            conninfo,
+            min_size=1,
+            max_size=4,
+            max_idle=300,
+            kwargs={"prepare_threshold": 3},
+            check=ConnectionPool.check_connection,
+            open=True,
+        )
+        atexit.register(_pool.close)
+    return _pool
 
-def connect_to_db() -> psycopg.Connection:
-    """Establish and return a database connection."""
-    conninfo = make_conninfo(
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        host=DB_HOST,
-        port=DB_PORT,
-    )
-    return psycopg.connect(conninfo)
 
+@contextmanager
+def connect_to_db(autocommit: bool = False) -> Iterator[psycopg.Connection]:
+    """Borrow a database connection from the pool."""
+    with get_pool().connection() as conn:
+        conn.autocommit = autocommit
+        yield conn
 
-def execute_query(query: str, params=None, fetch: bool = False):
-    """Execute a database query."""
+
+def execute_query(
+    query: str,
+    params=None,
+    fetch: Union[bool, Literal["scalar"]] = False,
+    prepare: bool = False,
+):
+    """Execute a database query; fetch="scalar" returns the first column of one row."""
     try:
-        with connect_to_db() as conn, conn.cursor() as cur:
-            cur.execute(query, params or ())
+        # Single fetch statements need no BEGIN/COMMIT around them
+        with connect_to_db(autocommit=bool(fetch)) as conn, conn.cursor() as cur:
+            cur.execute(query, params or (), prepare=prepare)
+            if fetch == "scalar":
+                row = cur.fetchone()
+                return row[0] if row else None
             if fetch:
                 return cur.fetchall()
             conn.commit()
@@ -35,6 +69,18 @@ def execute_query(query: str, params=None, fetch: bool = False):
         return None
 
 
+def execute_transaction(queries: List[str]):
+    """Execute several statements in a single transaction."""
+    try:
+        with connect_to_db() as conn, conn.cursor() as cur:
+            with conn.pipeline():
+                for query in queries:
+                    cur.execute(query)
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Transaction execution error: {e}")
+
+
 def host_status_init():
     """Initialize the host_status table."""
     query = """
@@ -44,7 +90,12 @@ def host_status_init():
             time TIMESTAMPTZ NOT NULL DEFAULT NOW()
         )
     """
-    execute_query(query)
+    execute_transaction(
+        [
+            query,
+            "CREATE INDEX IF NOT EXISTS host_status_time_idx ON host_status (time DESC)",
+        ]
+    )
     logger.info("host_status table initialized.")
 
 
@@ -60,59 +111,75 @@ def outage_schedule_init():
     logger.info("outage_schedule table initialized.")
 
 
-def host_status_save_status(status: bool):
-    """Save the current status."""
-    execute_query(
-        "INSERT INTO host_status (status, time) VALUES (%s, %s)",
-        (status, datetime.now(UTC_PLUS_2)),
-    )
-    logger.info(f"Status {'UP' if status else 'DOWN'} saved.")
-
-
-def host_status_get_last_status() -> Optional[bool]:
-    """Get the most recent status."""
-    result = execute_query(
-        "SELECT status FROM host_status ORDER BY id DESC LIMIT 1", fetch=True
+def host_status_save_status(status: bool, now: Optional[datetime] = None):
+    """Save the current status unless it repeats the most recent one."""
+    inserted_id = execute_query(
+        """
+        INSERT INTO host_status (status, time)
+        SELECT %(status)s, %(time)s
+        WHERE (
+            SELECT status FROM host_status ORDER BY id DESC LIMIT 1
+        ) IS DISTINCT FROM %(status)s
+        RETURNING id
+        """,
+        {"status": status, "time": now or datetime.now(UTC_PLUS_2)},
+        fetch="scalar",
+        prepare=True,
     )
-    return result[0][0] if result else None
+    if inserted_id is not None:
+        logger.info("Status {} saved.", "UP" if status else "DOWN")
 
 
-def host_status_get_total_time(previous_status: bool) -> Optional[timedelta]:
-    """Calculate total time since the last status change."""
+def host_status_get_last_change() -> Optional[Tuple[bool, datetime]]:
+    """Get the most recent status and the time it was recorded."""
     result = execute_query(
-        "SELECT time FROM host_status WHERE status = %s ORDER BY id DESC LIMIT 1",
-        (previous_status,),
+        "SELECT status, time FROM host_status ORDER BY id DESC LIMIT 1",
         fetch=True,
     )
-    return datetime.now(UTC_PLUS_2) - result[0][0] if result else None
+    return result[0] if result else None
 
 
-def outage_schedule_outdated(schedule_entries: List[Tuple[datetime]]) -> bool:
-    """Check if the fetched schedule differs from the existing schedule in the database."""
-    result = execute_query(
-        "SELECT time FROM outage_schedule WHERE time >= %s",
-        (datetime.now(UTC_PLUS_2),),
-        fetch=True,
-    )
-    if result is None:
-        return True
-    return set(schedule_entries) != set(result)
-
-
-def outage_schedule_update(schedule_entries: List[Tuple[datetime]]):
-    """Update the outage schedule in the database."""
+def outage_schedule_update(
+    schedule_entries: List[Tuple[datetime]], now: datetime
+) -> Optional[bool]:
+    """Replace the outage schedule from now on if it changed; None if that failed."""
     try:
         with connect_to_db() as conn, conn.cursor() as cur:
             cur.execute(
-                "DELETE FROM outage_schedule WHERE time >= %s",
-                (datetime.now(UTC_PLUS_2),),
+                """
+                SELECT EXISTS (
+                    (
+                        SELECT time FROM outage_schedule WHERE time >= %(now)s
+                        EXCEPT SELECT unnest(%(slots)s::timestamptz[])
+                    )
+                    UNION ALL
+                    (
+                        SELECT unnest(%(slots)s::timestamptz[])
+                        EXCEPT SELECT time FROM outage_schedule WHERE time >= %(now)s
+                    )
+                )
+                """,
+                {"slots": [entry[0] for entry in schedule_entries], "now": now},
+                prepare=True,
             )
-            insert_query = "INSERT INTO outage_schedule (time) VALUES (%s)"
-            cur.executemany(insert_query, schedule_entries)
+            if not cur.fetchone()[0]:
+                return False
+
+            cur.execute(
+                "DELETE FROM outage_schedule WHERE time >= %(now)s", {"now": now}
+            )
+            with cur.copy(
+                "COPY outage_schedule (time) FROM STDIN WITH (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(["timestamptz"])
+                for entry in schedule_entries:
+                    copy.write_row(entry)
             conn.commit()
         logger.info("Outage schedule updated.")
+        return True
     except Exception as e:
         logger.error(f"Error updating outage schedule: {e}")
+        return None
 
 
 def host_status_get_changes_between(
@@ -127,13 +194,25 @@ def host_status_get_changes_between(
     return result if result else []
 
 
-def outage_schedule_get_between(
+def report_get_events_between(
     start: datetime, end: datetime
-) -> List[Tuple[datetime]]:
-    """Retrieve outage schedules between two timestamps."""
+) -> List[Tuple[str, datetime, Optional[bool]]]:
+    """Retrieve the status before start, status changes and outages in one query."""
     result = execute_query(
-        "SELECT time FROM outage_schedule WHERE time BETWEEN %s AND %s ORDER BY time",
-        (start, end),
+        """
+        (
+            SELECT 'previous' AS source, time, status FROM host_status
+            WHERE time < %(start)s ORDER BY time DESC LIMIT 1
+        )
+        UNION ALL
+        SELECT 'status', time, status FROM host_status
+        WHERE time BETWEEN %(start)s AND %(end)s
+        UNION ALL
+        SELECT 'outage', time, NULL::boolean FROM outage_schedule
+        WHERE time BETWEEN %(start)s AND %(end)s
+        ORDER BY time
+        """,
+        {"start": start, "end": end},
         fetch=True,
     )
     return result if result else []
@@ -141,9 +220,9 @@ def outage_schedule_get_between(
 
 def host_status_get_last_status_before(time_point: datetime) -> bool:
     """Get the last status before a specific time."""
-    result = execute_query(
+    status = execute_query(
         "SELECT status FROM host_status WHERE time < %s ORDER BY time DESC LIMIT 1",
         (time_point,),
-        fetch=True,
+        fetch="scalar",
     )
-    return result[0][0] if result else True
+    return True if status is None else status
@@ -1,5 +1,6 @@
 # ping.py
 import socket
+import sys
 import time
 from datetime import datetime, timedelta
 
@@ -7,29 +8,43 @@ from loguru import logger
 
 from config import CHECK_INTERVAL, HOST_TO_MONITOR, PORT_TO_MONITOR, UTC_PLUS_2
 from db import (
-    host_status_get_last_status,
-    host_status_get_total_time,
+    host_status_get_last_change,
     host_status_init,
     host_status_save_status,
 )
-from tg import format_duration, send_telegram_message
+from tg import format_duration, send_telegram_message_nowait, sleep_until
 
+PROBE_ATTEMPTS = 3
+# Even a check whose every attempt times out finishes within one CHECK_INTERVAL,
+# without dropping the connect timeout so low that a slow link reads as down
+PROBE_TIMEOUT = max(1, min(5, CHECK_INTERVAL / (2 * PROBE_ATTEMPTS)))
+PROBE_RETRY_DELAY = min(1, CHECK_INTERVAL / (2 * PROBE_ATTEMPTS))
 
-def is_server_available(host: str, port: int, timeout: int = 5) -> bool:
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.settimeout(timeout)
-    try:
-        s.connect((host, port))
-        s.close()
-        return True
-    except Exception as e:
-        logger.error(f"Error checking host {host}: {e}")
-        return False
+
+def is_server_available(
+    host: str, port: int, timeout: float = PROBE_TIMEOUT, attempts: int = PROBE_ATTEMPTS
+) -> bool:
+    """Check whether a TCP connection to the host can be established."""
+    # Stop at the first successful connect; only repeated failures mean down
+    error = None
+    for attempt in range(1, attempts + 1):
+        if attempt > 1:
+            time.sleep(PROBE_RETRY_DELAY)
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError as e:
+            error = e
+            logger.debug(
+                "Attempt {}/{} to reach {} failed: {}", attempt, attempts, host, e
+            )
+    logger.error(f"Error checking host {host}: {error}")
+    return False
 
 
-def create_status_message(is_up: bool, duration: timedelta) -> str:
+def create_status_message(is_up: bool, duration: timedelta, now: datetime) -> str:
     """Create a status change message."""
-    current_time = datetime.now(UTC_PLUS_2).strftime("%H:%M")
+    current_time = now.strftime("%H:%M")
     duration_str = format_duration(duration)
     if is_up:
         return f"🟢 {current_time} Світло з'явилося\n🕓 Його не було {duration_str}"
@@ -39,32 +54,43 @@ def create_status_message(is_up: bool, duration: timedelta) -> str:
 
 def main():
     """Main monitoring loop."""
+    # Hand log records to a background writer so a slow sink never delays probes
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True)
+
     host_status_init()
 
-    last_status = host_status_get_last_status()
+    # Rows are only written on changes, so the latest one tells since when
+    # the current status holds; after this the database is only written to.
+    last_change = host_status_get_last_change()
+    last_status, status_since = last_change if last_change else (None, None)
 
+    deadline = time.monotonic() + CHECK_INTERVAL
     while True:
         current_status = is_server_available(HOST_TO_MONITOR, PORT_TO_MONITOR)
+        now = datetime.now(UTC_PLUS_2)
 
         if last_status is None:
             # Initial status
-            host_status_save_status(current_status)
+            host_status_save_status(current_status, now)
             status_str = "UP" if current_status else "DOWN"
-            logger.info(f"Host {HOST_TO_MONITOR}:{PORT_TO_MONITOR}"
-                        f"initial status is {status_str}")
-            last_status = current_status
+            logger.info(
+                "Host {}:{} initial status is {}",
+                HOST_TO_MONITOR,
+                PORT_TO_MONITOR,
+                status_str,
+            )
+            last_status, status_since = current_status, now
         elif current_status != last_status:
             # Status changed
-            host_status_save_status(current_status)
-            total_time = host_status_get_total_time(last_status)
-            if total_time is None:
-                total_time = timedelta()
-            message = create_status_message(current_status, total_time)
-            send_telegram_message(message)
+            host_status_save_status(current_status, now)
+            message = create_status_message(current_status, now - status_since, now)
+            send_telegram_message_nowait(message)
             logger.info(message)
-            last_status = current_status
+            last_status, status_since = current_status, now
 
-        time.sleep(CHECK_INTERVAL)
+        # Sleep until the next tick so probe time does not add to the interval
+        deadline = sleep_until(deadline, CHECK_INTERVAL)
 
 
 if __name__ == "__main__":
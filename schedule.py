@@ -2,31 +2,90 @@
 
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
 
+import orjson
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import CHECK_INTERVAL, GROUP_ID, UTC_PLUS_2
-from db import outage_schedule_init, outage_schedule_outdated, outage_schedule_update
-from tg import escape_markdown_v2, format_duration, send_telegram_message
-
-
-def fetch_schedule() -> List[Dict]:
-    """Fetch the schedule from the API and return processed data."""
-    url = "https://api.yasno.com.ua/api/v1/pages/home/schedule-turn-off-electricity"
-    current_time = datetime.now(UTC_PLUS_2)
-
-    if current_time.time() < (datetime.min + timedelta(minutes=5)).time():
-        logger.info("Skipping schedule fetching due to the time of the day.")
-        time.sleep(300)
+from db import outage_schedule_init, outage_schedule_update
+from tg import (
+    escape_markdown_v2,
+    format_duration,
+    send_telegram_message,
+    sleep_until,
+)
+
+SCHEDULE_URL = "https://api.yasno.com.ua/api/v1/pages/home/schedule-turn-off-electricity"
+SCHEDULE_ROLLOVER_DELAY = timedelta(minutes=5)
+SCHEDULE_TIMEOUT = (5, 30)
+
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json"})
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    ),
+)
+_schedule_cache: Dict[str, Optional[object]] = {
+    "etag": None,
+    "last_modified": None,
+    "date": None,
+}
+
+
+def fetch_schedule_data(
+    today: datetime.date,
+) -> Optional[Tuple[Dict, Dict[str, Optional[str]]]]:
+    """Fetch the raw schedule and its validators, or None when not modified."""
+    headers = {}
+    # Days are labelled "today" and "tomorrow", so an unchanged payload still
+    # has to be re-read once the date has rolled over
+    if _schedule_cache["date"] == today:
+        if _schedule_cache["etag"]:
+            headers["If-None-Match"] = _schedule_cache["etag"]
+        if _schedule_cache["last_modified"]:
+            headers["If-Modified-Since"] = _schedule_cache["last_modified"]
+
+    response = _session.get(SCHEDULE_URL, headers=headers, timeout=SCHEDULE_TIMEOUT)
+    if response.status_code == 304:
+        logger.debug("Schedule not modified.")
+        return None
+    response.raise_for_status()
+
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return orjson.loads(response.content), validators
+
+
+def fetch_schedule(
+    now: datetime,
+) -> Optional[Tuple[List[Dict], Dict[str, Optional[str]]]]:
+    """Fetch and process the schedule; None if it is unchanged or unavailable."""
     try:
-        response = requests.get(url)
-        data = response.json()
-    except Exception as e:
+        fetched = fetch_schedule_data(now.date())
+    except requests.RequestException as e:
         logger.error(f"Error fetching schedule: {e}")
-        return []
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error decoding schedule: {e}")
+        return None
+
+    if fetched is None:
+        return None
+    data, validators = fetched
+    return parse_schedule(data, now), validators
+
 
+def parse_schedule(data: Dict, current_time: datetime) -> List[Dict]:
+    """Build today's and tomorrow's upcoming outages from raw API data."""
     group_number = GROUP_ID
     schedules = []
 
@@ -34,36 +93,52 @@ def fetch_schedule() -> List[Dict]:
         date = current_time.date() + timedelta(days=days_ahead)
         schedule_data = extract_schedule_data(data, day_label, group_number)
         if schedule_data:
-            schedules.extend(process_schedule(schedule_data, date))
+            schedules.extend(process_schedule(schedule_data, date, current_time))
         else:
             logger.warning(f"{day_label.capitalize()}'s outage schedule is empty.")
 
     return schedules
 
 
+def find_daily_schedule(data: Dict) -> Dict:
+    """Find the daily schedule component wherever it sits in the page."""
+    component = next(
+        (c for c in data.get("components") or [] if "dailySchedule" in c), {}
+    )
+    return component.get("dailySchedule") or {}
+
+
 def extract_schedule_data(data: Dict, day_label: str, group_number: int) -> List[Dict]:
     """Extract schedule data for a specific day."""
-    try:
-        return data["components"][4]["dailySchedule"]["kiev"][day_label]["groups"][
-            group_number
-        ]
-    except (KeyError, IndexError):
+    # Days and groups may be present but null, not just missing
+    day_schedule = (find_daily_schedule(data).get("kiev") or {}).get(day_label) or {}
+    schedule_data = (day_schedule.get("groups") or {}).get(group_number)
+    if schedule_data is None:
         logger.warning(f"{day_label.capitalize()}'s schedule is not available.")
         return []
+    return schedule_data
 
 
-def process_schedule(schedule_data: List[Dict], date: datetime.date) -> List[Dict]:
-    """Process schedule data and include only future outages."""
-    schedule = []
-    for interval in schedule_data:
-        if interval.get("type") != "DEFINITE_OUTAGE":
-            continue
+def build_outage_slots(
+    date: datetime.date, start_hours: Tuple[int, ...]
+) -> Tuple[datetime, ...]:
+    """Build outage slot start times for a date."""
+    midnight = datetime(date.year, date.month, date.day, tzinfo=UTC_PLUS_2)
+    return tuple(midnight + timedelta(hours=start_hour) for start_hour in start_hours)
 
-        start_hour = interval["start"]
-        time_slot = datetime(
-            date.year, date.month, date.day, start_hour, tzinfo=UTC_PLUS_2
-        )
-        if time_slot < datetime.now(UTC_PLUS_2):
+
+def process_schedule(
+    schedule_data: List[Dict], date: datetime.date, now: datetime
+) -> List[Dict]:
+    """Process schedule data and drop outages that started before now."""
+    start_hours = tuple(
+        interval["start"]
+        for interval in schedule_data
+        if interval.get("type") == "DEFINITE_OUTAGE"
+    )
+    schedule = []
+    for time_slot in build_outage_slots(date, start_hours):
+        if time_slot < now:
             continue
 
         schedule.append(
@@ -76,26 +151,25 @@ def process_schedule(schedule_data: List[Dict], date: datetime.date) -> List[Dic
 
 
 def group_and_merge_intervals(intervals: List[Dict]) -> Dict[datetime.date, List[Dict]]:
-    """Group intervals by date and merge consecutive intervals."""
-    intervals.sort(key=lambda x: x["start"])
+    """Group intervals by date in date order and merge consecutive intervals."""
     grouped = {}
+    ordered = sorted(intervals, key=lambda x: x["start"])
 
-    for interval in intervals:
-        date_key = interval["start"].date()
-        grouped.setdefault(date_key, [])
-        day_intervals = grouped[date_key]
-
-        if day_intervals and interval["start"] == day_intervals[-1]["end"]:
-            day_intervals[-1]["end"] = interval["end"]
-        else:
-            day_intervals.append(interval)
+    for date_key, day_group in groupby(ordered, key=lambda x: x["start"].date()):
+        day_intervals = []
+        for interval in day_group:
+            if day_intervals and interval["start"] == day_intervals[-1]["end"]:
+                day_intervals[-1]["end"] = interval["end"]
+            else:
+                day_intervals.append(interval)
+        grouped[date_key] = day_intervals
 
     return grouped
 
 
-def build_message(intervals: List[Dict]) -> str:
+def build_message(intervals: List[Dict], now: datetime) -> str:
     """Construct a Telegram message based on intervals."""
-    current_time_str = datetime.now(UTC_PLUS_2).strftime("%d.%m.%Y %H:%M")
+    current_time_str = now.strftime("%d.%m.%Y %H:%M")
     header = (
         f"🗓️ Графік відключень, {GROUP_ID} група\n"
         f"🔄 Оновлено: {escape_markdown_v2(current_time_str)}"
@@ -108,7 +182,7 @@ def build_message(intervals: List[Dict]) -> str:
 
     grouped_intervals = group_and_merge_intervals(intervals)
 
-    for date, intervals in sorted(grouped_intervals.items()):
+    for date, intervals in grouped_intervals.items():
         date_str = date.strftime("на *%d\\.%m\\.%Y*")
         message_lines.append(f"\n{date_str}")
         for interval in intervals:
@@ -123,15 +197,27 @@ def build_message(intervals: List[Dict]) -> str:
 
 def update_and_notify():
     """Fetch schedule, update database, and send notifications."""
-    schedule_entries = fetch_schedule()
+    now = datetime.now(UTC_PLUS_2)
+    fetched = fetch_schedule(now)
+    if fetched is None:
+        # Nothing new to compare; an empty list would wipe the stored schedule
+        logger.info("No new schedule data available.")
+        return
+    schedule_entries, validators = fetched
 
     formatted_schedule_entries = [(entry["start"],) for entry in schedule_entries]
 
-    if outage_schedule_outdated(formatted_schedule_entries):
-        logger.info("Schedule update detected. Updating the database.")
-        outage_schedule_update(formatted_schedule_entries)
+    updated = outage_schedule_update(formatted_schedule_entries, now)
+    if updated is None:
+        # Keep the old validators so the next poll downloads the schedule again
+        logger.error("Schedule could not be saved to the database.")
+        return
+    _schedule_cache.update(validators, date=now.date())
+
+    if updated:
+        logger.info("Schedule update detected and saved to the database.")
 
-        message = build_message(schedule_entries)
+        message = build_message(schedule_entries, now)
         if message:
             send_telegram_message(message, parse_mode="MarkdownV2")
         logger.info("Schedule updated and message sent.")
@@ -139,13 +225,26 @@ def update_and_notify():
         logger.info("No new schedule data available.")
 
 
+def seconds_until_rollover(now: datetime) -> float:
+    """Return how long to wait until the API has rolled over to the new day."""
+    rollover = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    rollover += SCHEDULE_ROLLOVER_DELAY
+    return max((rollover - now).total_seconds(), 0)
+
+
 def main():
     """Main function to initialize and periodically fetch schedule."""
     outage_schedule_init()
 
+    deadline = time.monotonic() + CHECK_INTERVAL
     while True:
+        pause = seconds_until_rollover(datetime.now(UTC_PLUS_2))
+        if pause:
+            logger.info("Skipping schedule fetching due to the time of the day.")
+            time.sleep(pause)
+            deadline = time.monotonic() + CHECK_INTERVAL
         update_and_notify()
-        time.sleep(CHECK_INTERVAL)
+        deadline = sleep_until(deadline, CHECK_INTERVAL)
 
 
 if __name__ == "__main__":
@@ -22,7 +22,7 @@ def get_time_range_for_yesterday() -> Tuple[datetime, datetime]:
         yesterday.year, yesterday.month, yesterday.day, tzinfo=UTC_PLUS_2
     )
     end_of_day = start_of_day + timedelta(days=1) - timedelta(seconds=1)
-    logger.debug(f"Time range for yesterday: {start_of_day} to {end_of_day}")
+    logger.debug("Time range for yesterday: {} to {}", start_of_day, end_of_day)
     return start_of_day, end_of_day
 
 
@@ -45,7 +45,7 @@ def build_message(
         )
 
     full_message = message_header + message_body
-    logger.debug(f"Built message: {full_message}")
+    logger.debug("Built message: {}", full_message)
     return full_message
 
 
@@ -55,43 +55,20 @@ def calculate_total_times(
     """Calculate total on and off times within the specified time range."""
     rows = host_status_get_changes_between(start_time, end_time)
     previous_status = host_status_get_last_status_before(start_time)
-    total_on_time = timedelta()
-    total_off_time = timedelta()
+    totals = {True: timedelta(), False: timedelta()}
     previous_time = start_time
 
-    logger.debug(f"Previous status before start time: {previous_status}")
-    logger.debug(f"Status changes: {rows}")
-
-    if not rows:
-        duration = end_time - start_time
-        if previous_status:
-            total_on_time = duration
-            logger.debug(f"No status changes. Total on time: {duration}")
-        else:
-            total_off_time = duration
-            logger.debug(f"No status changes. Total off time: {duration}")
-        return total_on_time, total_off_time
-
-    for time_dt, status in rows:
-        duration = time_dt - previous_time
-        if previous_status:
-            total_on_time += duration
-            logger.debug(f"Adding {duration} to total on time.")
-        else:
-            total_off_time += duration
-            logger.debug(f"Adding {duration} to total off time.")
+    logger.debug("Previous status before start time: {}", previous_status)
+    logger.debug("Status changes: {}", rows)
+
+    # The end of the range closes the last interval
+    for time_dt, status in [*rows, (end_time, None)]:
+        totals[bool(previous_status)] += time_dt - previous_time
         previous_time = time_dt
         previous_status = status
 
-    # Add the remaining time until the end of the day
-    remaining_duration = end_time - previous_time
-    if previous_status:
-        total_on_time += remaining_duration
-        logger.debug(f"Adding remaining {remaining_duration} to total on time.")
-    else:
-        total_off_time += remaining_duration
-        logger.debug(f"Adding remaining {remaining_duration} to total off time.")
-
+    total_on_time, total_off_time = totals[True], totals[False]
+    logger.debug("Total on time: {}, total off time: {}", total_on_time, total_off_time)
     return total_on_time, total_off_time
 
 
@@ -1,6 +1,7 @@
 # statistic_week.py
 
 import os
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
@@ -9,13 +10,7 @@ import matplotlib.pyplot as plt
 from loguru import logger
 
 from config import UTC_PLUS_2
-from db import (
-    host_status_get_changes_between,
-    host_status_get_last_status_before,
-    host_status_init,
-    outage_schedule_get_between,
-    outage_schedule_init,
-)
+from db import host_status_init, outage_schedule_init, report_get_events_between
 from tg import send_telegram_image
 
 DAYS_OF_WEEK = [
@@ -32,10 +27,11 @@ DAYS_OF_WEEK = [
 def split_events_by_day(
     start_time: datetime, events: List[Tuple[datetime, bool]]
 ) -> Dict[str, List[Tuple[datetime, bool]]]:
-    """Split a list of events into daily intervals over a week starting from start_time."""
+    """Split a list of time-ordered events into daily intervals over a week starting from start_time."""
     intervals: Dict[str, List[Tuple[datetime, bool]]] = {
         day: [] for day in DAYS_OF_WEEK
     }
+    timestamps = [timestamp for timestamp, _ in events]
 
     for day_offset in range(7):
         day_start = start_time + timedelta(days=day_offset)
@@ -43,36 +39,47 @@ def split_events_by_day(
         day_name = day_start.strftime("%A")
 
         # Get events that occur on this day
-        day_events = [
-            (timestamp, status)
-            for timestamp, status in events
-            if day_start <= timestamp < day_end
-        ]
+        first = bisect_left(timestamps, day_start)
+        day_events = events[first : bisect_left(timestamps, day_end)]
 
         # Determine the status at the start of the day
-        prev_events = [
-            (timestamp, status) for timestamp, status in events if timestamp < day_start
-        ]
-        status = prev_events[-1][1] if prev_events else events[0][1] if events else True
+        status = events[first - 1][1] if first else events[0][1] if events else True
 
         intervals[day_name].append((day_start, status))
-        logger.debug(f"{day_name:>9} | {int(status)} | {day_start}")
+        logger.debug("{:>9} | {:d} | {}", day_name, status, day_start)
 
         for timestamp, status in day_events:
             intervals[day_name].append((timestamp, status))
-            logger.debug(f"{day_name:>9} | {int(status)} | {timestamp}")
+            logger.debug("{:>9} | {:d} | {}", day_name, status, timestamp)
 
     return intervals
 
 
+def get_week_events(
+    start_time: datetime,
+) -> Tuple[bool, List[Tuple[datetime, bool]], List[datetime]]:
+    """Fetch the status at start_time, status changes and outage times for a week."""
+    status_at_start = True
+    status_changes = []
+    outage_times = []
+    for source, timestamp, status in report_get_events_between(
+        start_time, start_time + timedelta(days=7)
+    ):
+        if source == "previous":
+            status_at_start = status
+        elif source == "status":
+            status_changes.append((timestamp, status))
+        else:
+            outage_times.append(timestamp)
+    return status_at_start, status_changes, outage_times
+
+
 def host_status_get_intervals_by_day(
     start_time: datetime,
+    status_at_start: bool,
+    all_changes: List[Tuple[datetime, bool]],
 ) -> Dict[str, List[Tuple[datetime, bool]]]:
-    """Retrieve host status intervals for each day starting from start_time over a week."""
-    status_at_start = host_status_get_last_status_before(start_time)
-    all_changes = host_status_get_changes_between(
-        start_time, start_time + timedelta(days=7)
-    )
+    """Split host status changes into intervals for each day starting from start_time."""
     events = [(start_time, status_at_start)] + [
         (timestamp.astimezone(UTC_PLUS_2), status) for timestamp, status in all_changes
     ]
@@ -82,12 +89,11 @@ def host_status_get_intervals_by_day(
 def merge_consecutive_outages(
     outage_times: List[datetime],
 ) -> List[Tuple[datetime, bool]]:
-    """Merge consecutive outage times into intervals with start and end times."""
+    """Merge time-ordered outage times into intervals with start and end times."""
     merged = []
     if not outage_times:
         return merged
 
-    outage_times.sort()
     current_start = outage_times[0]
     current_end = current_start + timedelta(hours=1)
 
@@ -104,13 +110,10 @@ def merge_consecutive_outages(
 
 def outage_schedule_get_intervals_by_day(
     start_time: datetime,
+    outage_entries: List[datetime],
 ) -> Dict[str, List[Tuple[datetime, bool]]]:
-    """Retrieve scheduled outage intervals for each day starting from start_time over a week."""
-    # Get all outage entries in the week
-    outage_entries = outage_schedule_get_between(
-        start_time, start_time + timedelta(days=7)
-    )
-    outage_times = [entry[0].astimezone(UTC_PLUS_2) for entry in outage_entries]
+    """Split scheduled outages into intervals for each day starting from start_time."""
+    outage_times = [entry.astimezone(UTC_PLUS_2) for entry in outage_entries]
 
     # Merge consecutive outages
     merged_outages = merge_consecutive_outages(outage_times)
@@ -154,6 +157,7 @@ def plot_weekly_intervals(
         """
         for day, day_intervals in intervals.items():
             day_num = day_to_num[day]
+            xranges = {True: [], False: []}
             for idx, (start, flag) in enumerate(day_intervals):
                 # Start time since midnight
                 start_of_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -166,11 +170,16 @@ def plot_weekly_intervals(
                 else:
                     duration = 24 - start_time
 
-                color = color_true if flag else color_false
+                xranges[bool(flag)].append((start_time, duration))
+
+            # One collection per day and colour instead of one per interval
+            for flag, day_xranges in xranges.items():
+                if not day_xranges:
+                    continue
                 ax.broken_barh(
-                    [(start_time, duration)],
+                    day_xranges,
                     (day_num + offset, bar_height),
-                    facecolors=color,
+                    facecolors=color_true if flag else color_false,
                     edgecolor="black",
                     linewidth=1.5,
                     alpha=1,
@@ -276,8 +285,13 @@ def main():
         hour=0, minute=0, second=0, microsecond=0
     )
 
-    actual_intervals = host_status_get_intervals_by_day(start_of_week)
-    scheduled_intervals = outage_schedule_get_intervals_by_day(start_of_week)
+    status_at_start, status_changes, outage_times = get_week_events(start_of_week)
+    actual_intervals = host_status_get_intervals_by_day(
+        start_of_week, status_at_start, status_changes
+    )
+    scheduled_intervals = outage_schedule_get_intervals_by_day(
+        start_of_week, outage_times
+    )
 
     plot_weekly_intervals(actual_intervals, scheduled_intervals)
 
@@ -1,17 +1,28 @@
 # utils.py
 
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict
 
 import requests
 from loguru import logger
 
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, UTC_PLUS_2
 
+TELEGRAM_TIMEOUT = 10
 
-def send_telegram_message(message: str, parse_mode: str = None) -> None:
-    """Send a message via Telegram Bot API with night-hour silent mode."""
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {"chat_id": TELEGRAM_CHAT_ID, "text": message}
+_session = requests.Session()
+
+_MD2_TABLE = str.maketrans({char: f"\\{char}" for char in r"_*[]()~`>#+-=|{}.!"})
+
+# A single worker keeps background messages in the order they were queued
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram")
+
+
+def build_payload(parse_mode: str = None) -> Dict:
+    """Build the common request fields, with night-hour silent mode."""
+    data = {"chat_id": TELEGRAM_CHAT_ID}
 
     current_hour = datetime.now(UTC_PLUS_2).hour
     if 23 <= current_hour or current_hour < 7:
@@ -19,15 +30,28 @@ def send_telegram_message(message: str, parse_mode: str = None) -> None:
 
     if parse_mode:
         data["parse_mode"] = parse_mode
+    return data
+
+
+def send_telegram_message(message: str, parse_mode: str = None) -> None:
+    """Send a message via Telegram Bot API with night-hour silent mode."""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    data = build_payload(parse_mode)
+    data["text"] = message
 
     try:
-        response = requests.post(url, data=data)
+        response = _session.post(url, data=data, timeout=TELEGRAM_TIMEOUT)
         response.raise_for_status()
         logger.info("Telegram message sent successfully.")
     except requests.RequestException as e:
         logger.error(f"Failed to send Telegram message: {e}")
 
 
+def send_telegram_message_nowait(message: str, parse_mode: str = None) -> Future:
+    """Queue a Telegram message to be sent in the background."""
+    return _executor.submit(send_telegram_message, message, parse_mode)
+
+
 def format_duration(duration: timedelta) -> str:
     """Format a timedelta into a readable string."""
     total_minutes = int(duration.total_seconds() // 60)
@@ -40,12 +64,21 @@ def format_duration(duration: timedelta) -> str:
     return " ".join(parts)
 
 
+def sleep_until(deadline: float, interval: float) -> float:
+    """Sleep until a monotonic deadline and return the next one."""
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+    else:
+        # Restart the cadence instead of running back-to-back to catch up
+        logger.warning("Iteration overran the {}s interval.", interval)
+        deadline = time.monotonic()
+    return deadline + interval
+
+
 def escape_markdown_v2(text: str) -> str:
     """Escape special characters for Telegram MarkdownV2."""
-    special_chars = r"_*[]()~`>#+-=|{}.!"
-    for char in special_chars:
-        text = text.replace(char, f"\\{char}")
-    return text
+    return text.translate(_MD2_TABLE)
 
 
 def send_telegram_image(
@@ -53,22 +86,16 @@ def send_telegram_image(
 ) -> None:
     """Send an image to a Telegram chat via the Bot API with optional caption and silent mode during night hours."""
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendPhoto"
-    data = {"chat_id": TELEGRAM_CHAT_ID}
-
-    # Night-hour silent mode
-    current_hour = datetime.now(UTC_PLUS_2).hour
-    if 23 <= current_hour or current_hour < 7:
-        data["disable_notification"] = True
-
+    data = build_payload(parse_mode)
     if caption:
         data["caption"] = caption
-    if parse_mode:
-        data["parse_mode"] = parse_mode
 
     try:
         with open(image_path, "rb") as photo_file:
             files = {"photo": photo_file}
-            response = requests.post(url, data=data, files=files)
+            response = _session.post(
+                url, data=data, files=files, timeout=TELEGRAM_TIMEOUT
+            )
             response.raise_for_status()
             logger.info("Telegram image sent successfully.")
     except FileNotFoundError: